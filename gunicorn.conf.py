@@ -0,0 +1,14 @@
+"""Gunicorn configuration for the webhook relay."""
+
+worker_class = "gthread"
+threads = 8
+preload_app = True
+worker_tmp_dir = "/dev/shm"
+
+
+def post_fork(server, worker):
+    # The log QueueListener thread started in the preloaded master does not
+    # survive the fork; restart it so worker records are actually drained.
+    from src.webhook_service import reinit_logging_after_fork
+
+    reinit_logging_after_fork()
@@ -6,16 +6,34 @@ CI/CD pipeline can react to real-world issue activity.
 """
 from __future__ import annotations
 
+import atexit
+import functools
 import hashlib
-import json
+import hmac
 import logging
 import os
+import queue
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict
+from urllib.parse import urlencode
 
+import orjson
 import requests
-from flask import Flask, jsonify, request
+from flask import Flask, Response, request
+from requests.adapters import HTTPAdapter, Retry
+
+_ENV_LINE = re.compile(
+    rb"(?m)^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(?:\"([^\"]*)\"|'([^']*)'|([^\r\n#]*))"
+)
+
+_TRUTHY = frozenset(("1", "true", "yes", "on"))
+_ALLOWED_ACTIONS = frozenset(("open", "reopen", "update", "edited"))
+
 
 def _load_env_file(path: str = ".env") -> None:
     """Populate os.environ from a dotenv-style file if present."""
@@ -23,31 +41,33 @@ def _load_env_file(path: str = ".env") -> None:
     if not env_path.exists():
         return
 
-    for raw_line in env_path.read_text(encoding="utf-8").splitlines():
-        line = raw_line.strip()
-        if not line or line.startswith("#"):
-            continue
-
-        key, sep, value = line.partition("=")
-        if not sep:
-            continue
-        key = key.strip()
-        if not key:
-            continue
-        if key in os.environ:
-            continue  # never override an explicitly provided value
-        os.environ[key] = value.strip().strip('"').strip("'")
+    raw = env_path.read_bytes()
+    parsed = {
+        match[1].decode(): (match[2] or match[3] or match[4] or b"").decode().rstrip()
+        for match in _ENV_LINE.finditer(raw)
+    }
+    # never override explicitly provided values
+    os.environ.update({k: v for k, v in parsed.items() if k not in os.environ})
 
 
 _load_env_file()
 
 
 def _configure_logging() -> logging.Logger:
-    logs_dir = Path("logs")
-    logs_dir.mkdir(parents=True, exist_ok=True)
-
-    log_file = logs_dir / f"{datetime.utcnow().strftime('%Y-%m-%d')}.log"
-    debug_enabled = os.getenv("LOG_DEBUG", "false").lower() in {"1", "true", "yes", "on"}
+    try:
+        os.mkdir("logs")
+    except FileExistsError:
+        pass
+
+    # Workers forked from a preloaded parent inherit the resolved path instead
+    # of re-deriving it; gmtime + f-string sidesteps strftime's locale lock.
+    log_file = os.environ.get("_RESOLVED_LOG_FILE")
+    if not log_file:
+        now = time.gmtime()
+        log_file = f"logs/{now.tm_year:04d}-{now.tm_mon:02d}-{now.tm_mday:02d}.log"
+        os.environ["_RESOLVED_LOG_FILE"] = log_file
+
+    debug_enabled = os.getenv("LOG_DEBUG", "false").lower() in _TRUTHY
     level = logging.DEBUG if debug_enabled else logging.INFO
 
     formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
@@ -61,12 +81,23 @@ def _configure_logging() -> logging.Logger:
     stream_handler.setFormatter(formatter)
     stream_handler.setLevel(level)
 
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
+    # Large write buffer so many small records coalesce into block-sized writes.
+    file_stream = open(log_file, "a", encoding="utf-8", buffering=1 << 16)
+    file_handler = logging.StreamHandler(file_stream)
     file_handler.setFormatter(formatter)
     file_handler.setLevel(level)
 
-    root_logger.addHandler(stream_handler)
-    root_logger.addHandler(file_handler)
+    # Batch file records in memory and drain them on a background thread so
+    # request threads never block on disk I/O; errors flush immediately.
+    buffered_handler = MemoryHandler(capacity=512, flushLevel=logging.ERROR, target=file_handler)
+    buffered_handler.setLevel(level)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler, buffered_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root_logger.addHandler(QueueHandler(log_queue))
     root_logger.debug("Logging configured (level=%s, file=%s)", logging.getLevelName(level), log_file)
     return logging.getLogger(__name__)
 
@@ -75,39 +106,125 @@ app = Flask(__name__)
 logger = _configure_logging()
 
 
+def reinit_logging_after_fork() -> None:
+    """Rebuild logging in a forked worker.
+
+    The QueueListener thread started at import does not survive a fork, so
+    records a worker enqueues would never be drained. gunicorn's post_fork
+    hook (see gunicorn.conf.py) calls this to give each worker its own
+    listener, handlers, and file stream.
+    """
+    global logger
+    logger = _configure_logging()
+
+
+def _json_response(data: Dict[str, Any], status: int = 200) -> Response:
+    """Build a JSON response via orjson, bypassing jsonify's stdlib encoder."""
+    return Response(orjson.dumps(data), status=status, mimetype="application/json")
+
+
+class _Lazy:
+    """Defer an expensive log argument; computed only if a handler accepts the record."""
+
+    __slots__ = ("_func", "_args")
+
+    def __init__(self, func: Callable[..., Any], *args: Any) -> None:
+        self._func = func
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._func(*self._args))
+
+
+_SENSITIVE_HEADERS = frozenset(("authorization", "x-gitlab-token", "private-token"))
+
+
 def _sanitize_headers(headers: Any) -> Dict[str, str]:
-    sensitive = {"authorization", "x-gitlab-token", "private-token"}
-    sanitized: Dict[str, str] = {}
-    for key, value in headers.items():
-        sanitized[key] = "***" if key.lower() in sensitive else value
-    return sanitized
+    return {
+        key: "***" if key.lower() in _SENSITIVE_HEADERS else value
+        for key, value in headers.items()
+    }
 
 
 class Settings:
     """Centralized runtime configuration with basic validation."""
 
     def __init__(self) -> None:
-        self.pipeline_trigger_token = self._require("PIPELINE_TRIGGER_TOKEN")
-        self.pipeline_project_id = self._require("PIPELINE_PROJECT_ID")
-        self.pipeline_ref = os.getenv("PIPELINE_REF", "main")
-        self.gitlab_api_base = os.getenv("GITLAB_API_BASE", "https://gitlab.com")
-        self.webhook_secret_token = os.getenv("WEBHOOK_SECRET_TOKEN")
-        self.default_target_branch = os.getenv("FALLBACK_TARGET_BRANCH", "main")
-        self.original_needs_max_chars = int(os.getenv("ORIGINAL_NEEDS_MAX_CHARS", "8192"))
-        self.copilot_agent_username = os.getenv("COPILOT_AGENT_USERNAME", "copilot-agent")
-        self.copilot_agent_commit_email = os.getenv("COPILOT_AGENT_COMMIT_EMAIL", "copilot@github.com")
-        self.enable_inline_review_comments = os.getenv("ENABLE_INLINE_REVIEW_COMMENTS", "true").lower() in {"true", "1", "yes", "on"}
-        self.copilot_language = os.getenv("COPILOT_LANGUAGE", "en")
+        # One environ snapshot instead of a dozen os.getenv round-trips.
+        env = os.environ.copy()
+        self.pipeline_trigger_token = self._require(env, "PIPELINE_TRIGGER_TOKEN")
+        self.pipeline_project_id = self._require(env, "PIPELINE_PROJECT_ID")
+        self.pipeline_ref = env.get("PIPELINE_REF", "main")
+        self.gitlab_api_base = env.get("GITLAB_API_BASE", "https://gitlab.com")
+        self.webhook_secret_token = env.get("WEBHOOK_SECRET_TOKEN")
+        self.default_target_branch = env.get("FALLBACK_TARGET_BRANCH", "main")
+        self.original_needs_max_chars = int(env.get("ORIGINAL_NEEDS_MAX_CHARS", "8192"))
+        self.copilot_agent_username = env.get("COPILOT_AGENT_USERNAME", "copilot-agent")
+        self.copilot_agent_commit_email = env.get("COPILOT_AGENT_COMMIT_EMAIL", "copilot@github.com")
+        self.enable_inline_review_comments = env.get("ENABLE_INLINE_REVIEW_COMMENTS", "true").lower() in _TRUTHY
+        self.copilot_language = env.get("COPILOT_LANGUAGE", "en")
+        # Ignored events skip the hooks/ write by default; opt back in when
+        # full forensics of the (often 10:1) filtered stream is worth the I/O.
+        self.persist_all_events = env.get("PERSIST_ALL_EVENTS", "false").lower() in _TRUTHY
+
+        # Derived values precomputed once; these are immutable after startup
+        # and would otherwise be rebuilt on every webhook.
+        self.agent_mention = f"@{self.copilot_agent_username}"
+        self.enable_inline_str = "true" if self.enable_inline_review_comments else "false"
+        self.webhook_secret_token_bytes = (self.webhook_secret_token or "").encode()
 
     @staticmethod
-    def _require(name: str) -> str:
-        value = os.getenv(name)
+    def _require(env: Dict[str, str], name: str) -> str:
+        value = env.get(name)
         if not value:
             raise RuntimeError(f"Environment variable {name} is required")
         return value
 
 
-settings = Settings()
+@functools.cache
+def get_settings() -> Settings:
+    """Build Settings once per process; tests can call get_settings.cache_clear()."""
+    return Settings()
+
+
+settings = get_settings()
+
+# Module-level alias so hot paths resolve a global instead of an attribute chain.
+_AGENT_MENTION = settings.agent_mention
+
+# Constant pipeline variables, pre-keyed in GitLab's trigger form format so
+# the POST body is assembled by dict merge instead of a per-request rekey loop.
+_COMMON_VARS = {
+    "variables[COPILOT_AGENT_USERNAME]": settings.copilot_agent_username,
+    "variables[COPILOT_AGENT_COMMIT_EMAIL]": settings.copilot_agent_commit_email,
+    "variables[COPILOT_LANGUAGE]": settings.copilot_language,
+}
+_MR_NOTE_BASE = {"variables[TRIGGER_TYPE]": "mr_note", **_COMMON_VARS}
+_MR_REVIEWER_BASE = {
+    "variables[TRIGGER_TYPE]": "mr_reviewer",
+    "variables[ENABLE_INLINE_REVIEW_COMMENTS]": settings.enable_inline_str,
+    **_COMMON_VARS,
+}
+_ISSUE_BASE = {"variables[TRIGGER_TYPE]": "issue_assignee", **_COMMON_VARS}
+
+# Persistence and the pipeline trigger run off the request thread so the WSGI
+# worker is released as soon as the event is validated.
+_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="webhook")
+atexit.register(_EXECUTOR.shutdown)
+
+# Shared session so repeated trigger calls reuse pooled TCP/TLS connections.
+# Retries only cover connection setup; POSTs are never replayed after the
+# request has been sent, so a pipeline cannot be triggered twice.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=(502, 503, 504)),
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
 
 
 def _validate_signature() -> bool:
@@ -119,13 +236,21 @@ def _validate_signature() -> bool:
     if not settings.webhook_secret_token:
         return True
 
-    header_token = request.headers.get("X-Gitlab-Token")
-    if header_token != settings.webhook_secret_token:
+    # Direct WSGI environ access skips Werkzeug's case-insensitive header
+    # wrapper for the one header we need here. Environ values are latin-1
+    # strings; compare as bytes so arbitrary header bytes cannot raise.
+    header_token = request.environ.get("HTTP_X_GITLAB_TOKEN", "")
+    if not hmac.compare_digest(header_token.encode("latin-1", "replace"), settings.webhook_secret_token_bytes):
         logger.warning("Invalid webhook token received")
         return False
     return True
 
 
+def _first(d: Dict[str, Any], *keys: str) -> Any:
+    """Return the first truthy value among keys in d, or '' if none."""
+    return next((v for k in keys if (v := d.get(k))), "")
+
+
 def _extract_mr_note_variables(payload: Dict[str, Any]) -> Dict[str, str]:
     """Extract variables from MR note event for pipeline.
 
@@ -136,9 +261,8 @@ def _extract_mr_note_variables(payload: Dict[str, Any]) -> Dict[str, str]:
     note_text = note_attrs.get("note", "")
 
     # Check if copilot agent is mentioned
-    agent_mention = f"@{settings.copilot_agent_username}"
-    if agent_mention not in note_text:
-        raise ValueError(f"{agent_mention} not mentioned in note")
+    if _AGENT_MENTION not in note_text:
+        raise ValueError(f"{_AGENT_MENTION} not mentioned in note")
 
     mr = payload.get("merge_request") or {}
     project = payload.get("project") or {}
@@ -149,50 +273,51 @@ def _extract_mr_note_variables(payload: Dict[str, Any]) -> Dict[str, str]:
     mr_iid = mr.get("iid", "")
     mr_id = mr.get("id", "")
 
-    target_repo_url = (
-        project.get("http_url")
-        or project.get("git_http_url")
-        or ""
-    )
+    target_repo_url = _first(project, "http_url", "git_http_url")
 
     target_project_id = project.get("id") or mr.get("target_project_id")
     target_project_path = project.get("path_with_namespace", "")
 
     # Extract instruction from note (remove agent mention prefix)
-    agent_mention = f"@{settings.copilot_agent_username}"
-    instruction = note_text.replace(agent_mention, "").strip()
+    instruction = note_text.replace(_AGENT_MENTION, "").strip()
+
+    missing = [
+        name
+        for name, value in (
+            ("TARGET_REPO_URL", target_repo_url),
+            ("TARGET_PROJECT_ID", target_project_id),
+            ("SOURCE_BRANCH", source_branch),
+            ("TARGET_MR_IID", mr_iid),
+        )
+        if not value
+    ]
+    if missing:
+        raise ValueError(f"Missing required MR/project fields: {', '.join(missing)}")
 
     variables = {
-        "TRIGGER_TYPE": "mr_note",
-        "MR_NOTE_INSTRUCTION": instruction,
-        "TARGET_REPO_URL": target_repo_url,
-        "TARGET_BRANCH": target_branch,
-        "SOURCE_BRANCH": source_branch,
-        "NEW_BRANCH_NAME": source_branch,  # Work on existing source branch
-        "TARGET_PROJECT_ID": str(target_project_id or ""),
-        "TARGET_PROJECT_PATH": target_project_path,
-        "TARGET_MR_IID": str(mr_iid),
-        "TARGET_MR_ID": str(mr_id),
-        "MR_TITLE": mr.get("title", ""),
-        "MR_URL": mr.get("url", ""),
-        "MR_AUTHOR_ID": str(mr.get("author_id", "")),
-        "NOTE_AUTHOR_ID": str(user.get("id", "")),
-        "NOTE_AUTHOR_USERNAME": user.get("username", ""),
-        "COPILOT_AGENT_USERNAME": settings.copilot_agent_username,
-        "COPILOT_AGENT_COMMIT_EMAIL": settings.copilot_agent_commit_email,
-        "COPILOT_LANGUAGE": settings.copilot_language,
+        **_MR_NOTE_BASE,
+        "variables[MR_NOTE_INSTRUCTION]": instruction,
+        "variables[TARGET_REPO_URL]": target_repo_url,
+        "variables[TARGET_BRANCH]": target_branch,
+        "variables[SOURCE_BRANCH]": source_branch,
+        "variables[NEW_BRANCH_NAME]": source_branch,  # Work on existing source branch
+        "variables[TARGET_PROJECT_ID]": str(target_project_id or ""),
+        "variables[TARGET_PROJECT_PATH]": target_project_path,
+        "variables[TARGET_MR_IID]": str(mr_iid),
+        "variables[TARGET_MR_ID]": str(mr_id),
+        "variables[MR_TITLE]": mr.get("title", ""),
+        "variables[MR_URL]": mr.get("url", ""),
+        "variables[MR_AUTHOR_ID]": str(mr.get("author_id", "")),
+        "variables[NOTE_AUTHOR_ID]": str(user.get("id", "")),
+        "variables[NOTE_AUTHOR_USERNAME]": user.get("username", ""),
     }
 
-    missing = [k for k in ("TARGET_REPO_URL", "TARGET_PROJECT_ID", "SOURCE_BRANCH", "TARGET_MR_IID") if not variables.get(k)]
-    if missing:
-        raise ValueError(f"Missing required MR/project fields: {', '.join(missing)}")
-
     logger.debug(
         "Extracted MR note vars project_id=%s source_branch=%s target_branch=%s mr_iid=%s",
-        variables["TARGET_PROJECT_ID"],
-        variables["SOURCE_BRANCH"],
-        variables["TARGET_BRANCH"],
-        variables["TARGET_MR_IID"],
+        target_project_id,
+        source_branch,
+        target_branch,
+        mr_iid,
     )
 
     return variables
@@ -204,15 +329,18 @@ def _extract_mr_reviewer_variables(payload: Dict[str, Any]) -> Dict[str, str]:
     Raises:
         ValueError: If required fields are missing or copilot-agent not assigned as reviewer.
     """
+    # Fast pre-check: most MR events carry no reviewer change at all.
+    if "reviewers" not in (payload.get("changes") or ()):
+        raise ValueError("No reviewer change in payload, ignoring event")
+
     mr = payload.get("object_attributes") or {}
     project = payload.get("project") or {}
     user = payload.get("user") or {}
     changes = payload.get("changes") or {}
 
     action = (mr.get("action") or "").lower()
-    allowed_actions = {"open", "reopen", "update", "edited"}
-    if action not in allowed_actions:
-        logger.debug("Ignoring action '%s' (allowed=%s)", action, allowed_actions)
+    if action not in _ALLOWED_ACTIONS:
+        logger.debug("Ignoring action '%s' (allowed=%s)", action, _ALLOWED_ACTIONS)
         raise ValueError(f"Ignoring unsupported MR action '{action}'")
 
     # Check if Copilot is assigned as reviewer in the changes
@@ -239,48 +367,49 @@ def _extract_mr_reviewer_variables(payload: Dict[str, Any]) -> Dict[str, str]:
     mr_title = mr.get("title", "")
     mr_description = mr.get("description", "")
 
-    target_repo_url = (
-        project.get("http_url")
-        or project.get("git_http_url")
-        or ""
-    )
+    target_repo_url = _first(project, "http_url", "git_http_url")
 
     target_project_id = project.get("id") or mr.get("target_project_id")
     target_project_path = project.get("path_with_namespace", "")
 
-    variables = {
-        "TRIGGER_TYPE": "mr_reviewer",
-        "TARGET_REPO_URL": target_repo_url,
-        "TARGET_BRANCH": target_branch,
-        "SOURCE_BRANCH": source_branch,
-        "TARGET_PROJECT_ID": str(target_project_id or ""),
-        "TARGET_PROJECT_PATH": target_project_path,
-        "TARGET_MR_IID": str(mr_iid),
-        "TARGET_MR_ID": str(mr_id),
-        "MR_TITLE": mr_title,
-        "MR_DESCRIPTION": mr_description,
-        "MR_URL": mr.get("url", ""),
-        "MR_AUTHOR_ID": str(mr.get("author_id", "")),
-        "MR_ACTION": action,
-        "MR_STATE": mr.get("state", ""),
-        "REVIEWER_ASSIGNER_ID": str(user.get("id", "")),
-        "REVIEWER_ASSIGNER_USERNAME": user.get("username", ""),
-        "COPILOT_AGENT_USERNAME": settings.copilot_agent_username,
-        "COPILOT_AGENT_COMMIT_EMAIL": settings.copilot_agent_commit_email,
-        "ENABLE_INLINE_REVIEW_COMMENTS": "true" if settings.enable_inline_review_comments else "false",
-        "COPILOT_LANGUAGE": settings.copilot_language,
-    }
-
-    missing = [k for k in ("TARGET_REPO_URL", "TARGET_PROJECT_ID", "SOURCE_BRANCH", "TARGET_MR_IID") if not variables.get(k)]
+    missing = [
+        name
+        for name, value in (
+            ("TARGET_REPO_URL", target_repo_url),
+            ("TARGET_PROJECT_ID", target_project_id),
+            ("SOURCE_BRANCH", source_branch),
+            ("TARGET_MR_IID", mr_iid),
+        )
+        if not value
+    ]
     if missing:
         raise ValueError(f"Missing required MR/project fields: {', '.join(missing)}")
 
+    variables = {
+        **_MR_REVIEWER_BASE,
+        "variables[TARGET_REPO_URL]": target_repo_url,
+        "variables[TARGET_BRANCH]": target_branch,
+        "variables[SOURCE_BRANCH]": source_branch,
+        "variables[TARGET_PROJECT_ID]": str(target_project_id or ""),
+        "variables[TARGET_PROJECT_PATH]": target_project_path,
+        "variables[TARGET_MR_IID]": str(mr_iid),
+        "variables[TARGET_MR_ID]": str(mr_id),
+        "variables[MR_TITLE]": mr_title,
+        "variables[MR_DESCRIPTION]": mr_description,
+        "variables[MR_URL]": mr.get("url", ""),
+        "variables[MR_AUTHOR_ID]": str(mr.get("author_id", "")),
+        "variables[MR_ACTION]": action,
+        "variables[MR_STATE]": mr.get("state", ""),
+        "variables[REVIEWER_ASSIGNER_ID]": str(user.get("id", "")),
+        "variables[REVIEWER_ASSIGNER_USERNAME]": user.get("username", ""),
+    }
+
     logger.debug(
         "Extracted MR reviewer vars project_id=%s source_branch=%s target_branch=%s mr_iid=%s",
-        variables["TARGET_PROJECT_ID"],
-        variables["SOURCE_BRANCH"],
-        variables["TARGET_BRANCH"],
-        variables["TARGET_MR_IID"],
+        target_project_id,
+        source_branch,
+        target_branch,
+        mr_iid,
     )
 
     return variables
@@ -292,15 +421,18 @@ def _extract_variables(payload: Dict[str, Any]) -> Dict[str, str]:
     Raises:
         ValueError: If action is not allowed or required fields are missing.
     """
+    # Fast pre-check: most issue events carry no assignee change at all.
+    if "assignees" not in (payload.get("changes") or ()):
+        raise ValueError("No assignee change in payload, ignoring event")
+
     issue = payload.get("object_attributes") or {}
     project = payload.get("project") or {}
     repository = payload.get("repository") or {}
     user = payload.get("user") or {}
 
     action = (issue.get("action") or "").lower()
-    allowed_actions = {"open", "reopen", "update", "edited"}
-    if action not in allowed_actions:
-        logger.debug("Ignoring action '%s' (allowed=%s)", action, allowed_actions)
+    if action not in _ALLOWED_ACTIONS:
+        logger.debug("Ignoring action '%s' (allowed=%s)", action, _ALLOWED_ACTIONS)
         raise ValueError(f"Ignoring unsupported issue action '{action}'")
 
     # Check if Copilot is assigned in the changes
@@ -334,84 +466,198 @@ def _extract_variables(payload: Dict[str, Any]) -> Dict[str, str]:
     )
 
     target_repo_url = (
-        project.get("http_url")
-        or project.get("git_http_url")
-        or repository.get("url")
-        or repository.get("homepage")
-        or ""
+        _first(project, "http_url", "git_http_url")
+        or _first(repository, "url", "homepage")
     )
 
     target_project_id = project.get("id") or issue.get("project_id")
     target_project_path = project.get("path_with_namespace") or repository.get("name")
 
-    variables = {
-        "TRIGGER_TYPE": "issue_assignee",
-        "ORIGINAL_NEEDS": original_needs,
-        "TARGET_REPO_URL": target_repo_url,
-        "TARGET_BRANCH": target_branch,
-        "TARGET_PROJECT_ID": str(target_project_id or ""),
-        "TARGET_PROJECT_PATH": target_project_path or "",
-        "TARGET_ISSUE_IID": str(issue.get("iid", "")),
-        "TARGET_ISSUE_ID": str(issue.get("id", "")),
-        "ISSUE_AUTHOR_ID": str(issue.get("author_id", "")),
-        "ISSUE_TITLE": issue.get("title", ""),
-        "ISSUE_URL": issue.get("url", ""),
-        "ISSUE_ACTION": issue.get("action", ""),
-        "ISSUE_STATE": issue.get("state", ""),
-        "ISSUE_UPDATED_AT": issue.get("updated_at", ""),
-        "ISSUE_ASSIGNEE_USERNAME": user.get("username", ""),
-        "COPILOT_AGENT_USERNAME": settings.copilot_agent_username,
-        "COPILOT_AGENT_COMMIT_EMAIL": settings.copilot_agent_commit_email,
-        "COPILOT_LANGUAGE": settings.copilot_language,
-    }
-
-    missing = [k for k in ("TARGET_REPO_URL", "TARGET_PROJECT_ID", "TARGET_ISSUE_IID") if not variables.get(k)]
+    missing = [
+        name
+        for name, value in (
+            ("TARGET_REPO_URL", target_repo_url),
+            ("TARGET_PROJECT_ID", target_project_id),
+            ("TARGET_ISSUE_IID", issue.get("iid")),
+        )
+        if not value
+    ]
     if missing:
         raise ValueError(f"Missing required issue/project fields: {', '.join(missing)}")
 
+    variables = {
+        **_ISSUE_BASE,
+        "variables[ORIGINAL_NEEDS]": original_needs,
+        "variables[TARGET_REPO_URL]": target_repo_url,
+        "variables[TARGET_BRANCH]": target_branch,
+        "variables[TARGET_PROJECT_ID]": str(target_project_id or ""),
+        "variables[TARGET_PROJECT_PATH]": target_project_path or "",
+        "variables[TARGET_ISSUE_IID]": str(issue.get("iid", "")),
+        "variables[TARGET_ISSUE_ID]": str(issue.get("id", "")),
+        "variables[ISSUE_AUTHOR_ID]": str(issue.get("author_id", "")),
+        "variables[ISSUE_TITLE]": issue.get("title", ""),
+        "variables[ISSUE_URL]": issue.get("url", ""),
+        "variables[ISSUE_ACTION]": issue.get("action", ""),
+        "variables[ISSUE_STATE]": issue.get("state", ""),
+        "variables[ISSUE_UPDATED_AT]": issue.get("updated_at", ""),
+        "variables[ISSUE_ASSIGNEE_USERNAME]": user.get("username", ""),
+    }
+
     logger.debug(
         "Extracted vars action=%s project_id=%s branch=%s repo=%s",
         action,
-        variables["TARGET_PROJECT_ID"],
-        variables["TARGET_BRANCH"],
-        variables["TARGET_REPO_URL"],
+        target_project_id,
+        target_branch,
+        target_repo_url,
     )
 
     return variables
 
 
+# Sections (and the fields within them) that the extractors actually consume;
+# everything else in the 50-200KB GitLab payload is dropped before persistence.
+_KEPT = {
+    "object_attributes": frozenset((
+        "iid", "id", "action", "state", "title", "url", "description",
+        "source_branch", "target_branch", "note", "noteable_type",
+        "author_id", "updated_at", "project_id", "target_project_id",
+    )),
+    "merge_request": frozenset((
+        "iid", "id", "title", "url", "author_id",
+        "source_branch", "target_branch", "target_project_id",
+    )),
+    "project": frozenset(("id", "http_url", "git_http_url", "path_with_namespace", "default_branch")),
+    "repository": frozenset(("url", "homepage", "name", "default_branch")),
+    "user": frozenset(("id", "username")),
+    "changes": frozenset(("assignees", "reviewers")),
+}
+
+_KEPT_TOP_LEVEL = ("object_kind", "event_type", "event_name")
+
+
+def _slim(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Project the payload onto the fields the extractors and reviews use."""
+    slimmed: Dict[str, Any] = {}
+    for key in _KEPT_TOP_LEVEL:
+        if key in payload:
+            slimmed[key] = payload[key]
+    for section, kept in _KEPT.items():
+        value = payload.get(section)
+        if isinstance(value, dict):
+            slimmed[section] = {k: v for k, v in value.items() if k in kept}
+    return slimmed
+
+
 def _persist_payload(payload: Dict[str, Any]) -> Path:
-    """Store the raw webhook payload under hooks/ for later inspection."""
+    """Store the relevant slice of the webhook payload under hooks/ for later inspection."""
     hooks_dir = Path("hooks")
     hooks_dir.mkdir(parents=True, exist_ok=True)
 
     timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%fZ")
-    digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:10]
-    hook_path = hooks_dir / f"issue-{timestamp}-{digest}.json"
-    hook_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    # Serialize once and hash the same bytes we write; the µs timestamp
+    # already disambiguates filenames, so canonical key ordering is unneeded.
+    body = orjson.dumps(_slim(payload), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    hasher = hashlib.blake2b(digest_size=5)
+    # Write under a dotted pending name while the digest is computed from the
+    # outgoing bytes, then rename; hooks/ readers never see partial files.
+    pending_path = hooks_dir / f".pending-{timestamp}.json"
+    # Single os.write of the already-encoded bytes; no buffered wrapper layers.
+    fd = os.open(pending_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        hasher.update(body)
+        os.write(fd, body)
+    finally:
+        os.close(fd)
+    hook_path = hooks_dir / f"issue-{timestamp}-{hasher.hexdigest()}.json"
+    os.rename(pending_path, hook_path)
     return hook_path
 
 
+def _persist_ignored(payload: Dict[str, Any]) -> None:
+    """Persist an ignored event's payload off-thread, logging any failure."""
+    try:
+        saved_path = _persist_payload(payload)
+        logger.info("Persisted ignored event payload to %s", saved_path)
+    except Exception:  # pragma: no cover - defensive; executor swallows exceptions
+        logger.exception("Failed to persist ignored event payload")
+
+
+def _persist_and_trigger(payload: Dict[str, Any], vars_for_pipeline: Dict[str, str]) -> None:
+    """Persist the payload and trigger the CI pipeline off the request thread."""
+    try:
+        saved_path = _persist_payload(payload)
+        logger.info("Persisted webhook payload to %s", saved_path)
+
+        pipeline_project_id = settings.pipeline_project_id
+
+        trigger_url = f"{settings.gitlab_api_base}/api/v4/projects/{pipeline_project_id}/trigger/pipeline"
+        data = {
+            "token": settings.pipeline_trigger_token,
+            "ref": settings.pipeline_ref,
+            **vars_for_pipeline,
+        }
+
+        logger.debug(
+            "Trigger URL=%s ref=%s variable_keys=%s",
+            trigger_url,
+            settings.pipeline_ref,
+            _Lazy(sorted, vars_for_pipeline),
+        )
+
+        logger.info(
+            "Triggering pipeline %s (ref=%s) for issue #%s",
+            pipeline_project_id,
+            settings.pipeline_ref,
+            vars_for_pipeline.get("variables[TARGET_ISSUE_IID]"),
+        )
+
+        # Encode the form body once ourselves; split connect/read timeouts so
+        # a stalled connection cannot eat the whole read budget.
+        form_body = urlencode(data).encode()
+
+        try:
+            response = _SESSION.post(trigger_url, data=form_body, headers=_FORM_HEADERS, timeout=(3, 15))
+        except requests.RequestException:  # pragma: no cover - network failure
+            logger.exception("Pipeline trigger HTTP request failed")
+            return
+
+        if response.status_code >= 300:
+            # GitLab error bodies can be multi-MB HTML; keep only the head.
+            reason = response.content[:512].decode("utf-8", "replace")
+            logger.error("Pipeline trigger failed: %s", reason)
+            return
+
+        body = orjson.loads(response.content)
+        logger.info(
+            "Pipeline %s queued (ref=%s): %s",
+            body.get("id"),
+            body.get("ref"),
+            body.get("web_url"),
+        )
+    except Exception:  # pragma: no cover - defensive; executor swallows exceptions
+        logger.exception("Background webhook processing failed")
+
+
 @app.post("/webhook")
 def issue_webhook() -> Any:
     """Handle GitLab issue update events, MR note events, and MR reviewer events, triggering the CI pipeline."""
     # Validate webhook signature
     if not _validate_signature():
-        return jsonify({"status": "ignored", "reason": "Invalid webhook token"}), 401
+        return _json_response({"status": "ignored", "reason": "Invalid webhook token"}, 401)
 
     event_name = request.headers.get("X-Gitlab-Event")
-    logger.debug("Incoming headers: %s", _sanitize_headers(request.headers))
+    logger.debug("Incoming headers: %s", _Lazy(_sanitize_headers, request.headers))
     if event_name not in  ["Issue Hook", "Note Hook", "Merge Request Hook"]:
         logger.debug("Ignoring event: %s", event_name)
-        return jsonify({"status": "ignored", "reason": "Unsupported event type"}), 202
+        return _json_response({"status": "ignored", "reason": "Unsupported event type"}, 202)
 
-    payload = request.get_json(silent=True)
+    try:
+        payload = orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        payload = None
     if not payload:
         logger.warning("Received request without JSON payload")
-        return jsonify({"status": "error", "reason": "Expected JSON payload"}), 400
-
-    saved_path = _persist_payload(payload)
-    logger.info("Persisted webhook payload to %s", saved_path)
+        return _json_response({"status": "error", "reason": "Expected JSON payload"}, 400)
 
     # Determine event type and extract variables
     try:
@@ -422,7 +668,9 @@ def issue_webhook() -> Any:
                 vars_for_pipeline = _extract_mr_note_variables(payload)
             else:
                 logger.debug("Ignoring note on %s", noteable_type)
-                return jsonify({"status": "ignored", "reason": f"Note on {noteable_type} not supported"}), 202
+                if settings.persist_all_events:
+                    _EXECUTOR.submit(_persist_ignored, payload)
+                return _json_response({"status": "ignored", "reason": f"Note on {noteable_type} not supported"}, 202)
         elif event_name == "Merge Request Hook":
             logger.info("Processing MR reviewer event")
             vars_for_pipeline = _extract_mr_reviewer_variables(payload)
@@ -431,60 +679,18 @@ def issue_webhook() -> Any:
             vars_for_pipeline = _extract_variables(payload)
     except ValueError as exc:
         logger.info("Skipping event: %s", exc)
-        return jsonify({"status": "ignored", "reason": str(exc)}), 202
-    
-    pipeline_project_id = settings.pipeline_project_id
+        if settings.persist_all_events:
+            _EXECUTOR.submit(_persist_ignored, payload)
+        return _json_response({"status": "ignored", "reason": str(exc)}, 202)
 
-    trigger_url = f"{settings.gitlab_api_base}/api/v4/projects/{pipeline_project_id}/trigger/pipeline"
-    data = {
-        "token": settings.pipeline_trigger_token,
-        "ref": settings.pipeline_ref,
-    }
-    for key, value in vars_for_pipeline.items():
-        data[f"variables[{key}]"] = value
-
-    logger.debug(
-        "Trigger URL=%s ref=%s variable_keys=%s",
-        trigger_url,
-        settings.pipeline_ref,
-        sorted(vars_for_pipeline.keys()),
-    )
-
-    logger.info(
-        "Triggering pipeline %s (ref=%s) for issue #%s",
-        pipeline_project_id,
-        settings.pipeline_ref,
-        vars_for_pipeline.get("TARGET_ISSUE_IID"),
-    )
-
-    # return jsonify({})
-
-    try:
-        response = requests.post(trigger_url, data=data, timeout=15)
-    except requests.RequestException as exc:  # pragma: no cover - network failure
-        logger.exception("Pipeline trigger HTTP request failed")
-        return jsonify({
-            "status": "error",
-            "reason": f"Pipeline trigger request failed: {exc}"
-        }), 502
-
-    if response.status_code >= 300:
-        logger.error("Pipeline trigger failed: %s", response.text)
-        return jsonify({
-            "status": "error",
-            "reason": response.text or "Failed to trigger pipeline"
-        }), response.status_code
-
-    body = response.json()
-    return jsonify({
-        "status": "queued",
-        "pipeline_id": body.get("id"),
-        "web_url": body.get("web_url"),
-        "ref": body.get("ref"),
-    })
+    # Respond immediately; the disk write and trigger round-trip happen on the
+    # executor so GitLab never retries because of slow remote I/O.
+    _EXECUTOR.submit(_persist_and_trigger, payload, vars_for_pipeline)
+    return _json_response({"status": "accepted"}, 202)
 
 
 def main() -> None:
+    """Run the Werkzeug dev server; production deploys use gunicorn (see Dockerfile)."""
     host = os.getenv("LISTEN_HOST", "0.0.0.0")
     port = int(os.getenv("LISTEN_PORT", "8080"))
     app.run(host=host, port=port)